@@ -1,8 +1,11 @@
+from sqlalchemy import inspect, text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from app.config import settings
 
-engine = create_async_engine(settings.database_url, echo=settings.debug)
+# Filter/sort/cursor combinations in get_companies yield many distinct statement
+# shapes; a larger compiled-statement cache keeps them all warm
+engine = create_async_engine(settings.database_url, echo=settings.debug, query_cache_size=1200)
 async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 
@@ -16,3 +19,49 @@ async def init_db():
 
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        added = await conn.run_sync(_add_missing_columns)
+        await conn.run_sync(_create_missing_indexes)
+
+    if "estimated_revenue_numeric" in added:
+        from app.services.company_service import backfill_revenue_numeric
+
+        async with async_session() as session:
+            await backfill_revenue_numeric(session)
+
+
+# Columns added after a table was first created: (table, column, DDL, backfill SQL or None)
+_ADDED_COLUMNS = [
+    ("companies", "estimated_revenue_numeric", "BIGINT", None),
+    (
+        "companies", "contact_count", "INTEGER NOT NULL DEFAULT 0",
+        "UPDATE companies SET contact_count = "
+        "(SELECT COUNT(*) FROM contacts WHERE contacts.company_id = companies.id)",
+    ),
+]
+
+
+def _add_missing_columns(sync_conn) -> set[str]:
+    """One-time migrations for databases created before a column existed.
+
+    create_all() never alters existing tables, so add the columns here.
+    Returns the names of the columns that were added.
+    """
+    inspector = inspect(sync_conn)
+    added = set()
+    for table, column, ddl, backfill in _ADDED_COLUMNS:
+        if column in {c["name"] for c in inspector.get_columns(table)}:
+            continue
+        sync_conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+        if backfill:
+            sync_conn.execute(text(backfill))
+        added.add(column)
+    return added
+
+
+def _create_missing_indexes(sync_conn) -> None:
+    """create_all() only emits indexes with new tables; add ones declared later."""
+    from app.db.models import Base
+
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(sync_conn, checkfirst=True)
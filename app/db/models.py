@@ -1,6 +1,8 @@
 from datetime import datetime, timezone
 
 from sqlalchemy import (
+    DDL,
+    BigInteger,
     Column,
     DateTime,
     Float,
@@ -10,6 +12,7 @@ from sqlalchemy import (
     String,
     Text,
     UniqueConstraint,
+    event,
 )
 from sqlalchemy.orm import DeclarativeBase, relationship
 
@@ -18,6 +21,14 @@ class Base(DeclarativeBase):
     pass
 
 
+# Trigram indexes below need pg_trgm; other dialects skip both
+event.listen(
+    Base.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+
+
 class Company(Base):
     __tablename__ = "companies"
 
@@ -31,6 +42,7 @@ class Company(Base):
     employee_count_range = Column(String(50))
     employee_count = Column(Integer, nullable=True)
     estimated_revenue = Column(String(100))
+    estimated_revenue_numeric = Column(BigInteger, nullable=True)  # parsed from estimated_revenue on write
     revenue_source = Column(String(50))  # page_text, structured_data, estimated
     city = Column(String(200))
     state = Column(String(100))
@@ -42,11 +54,38 @@ class Company(Base):
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
     updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
     scrape_job_id = Column(Integer, ForeignKey("scrape_jobs.id"), nullable=True)
+    contact_count = Column(Integer, nullable=False, default=0, server_default="0")  # kept in sync by contact_service
 
     contacts = relationship("Contact", back_populates="company", cascade="all, delete-orphan")
     scrape_job = relationship("ScrapeJob", back_populates="companies")
 
 
+Index("ix_company_revenue_numeric", Company.estimated_revenue_numeric)
+
+# (sort column, id) pairs back keyset pagination in company_service.get_companies
+Index("ix_company_created_at_id", Company.created_at, Company.id)
+Index("ix_company_name_id", Company.name, Company.id)
+Index("ix_company_industry_id", Company.industry, Company.id)
+Index("ix_company_employee_count_id", Company.employee_count, Company.id)
+Index("ix_company_estimated_revenue_id", Company.estimated_revenue, Company.id)
+Index("ix_company_city_id", Company.city, Company.id)
+Index("ix_company_state_id", Company.state, Company.id)
+
+# Trigram GIN indexes let Postgres serve the ilike('%term%') search without a seq scan
+Index(
+    "ix_company_name_trgm", Company.name,
+    postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"},
+).ddl_if(dialect="postgresql")
+Index(
+    "ix_company_domain_trgm", Company.domain,
+    postgresql_using="gin", postgresql_ops={"domain": "gin_trgm_ops"},
+).ddl_if(dialect="postgresql")
+Index(
+    "ix_company_city_trgm", Company.city,
+    postgresql_using="gin", postgresql_ops={"city": "gin_trgm_ops"},
+).ddl_if(dialect="postgresql")
+
+
 class Contact(Base):
     __tablename__ = "contacts"
     __table_args__ = (
@@ -128,3 +167,10 @@ class ScrapeQueue(Base):
 
 
 Index("ix_scrape_queue_job_status", ScrapeQueue.scrape_job_id, ScrapeQueue.status)
+# Covers the pending-item poll in job_service in index order, without sorting
+Index(
+    "ix_scrape_queue_pending",
+    ScrapeQueue.scrape_job_id, ScrapeQueue.priority.desc(), ScrapeQueue.id,
+    postgresql_where=ScrapeQueue.status == "pending",
+    sqlite_where=ScrapeQueue.status == "pending",
+)
@@ -8,6 +8,9 @@ from fastapi.templating import Jinja2Templates
 from app.db.database import init_db
 from app.routers import companies, contacts, export, jobs, stats
 from app.scraper.engine import cleanup_stale_jobs
+from app.scraper.http_client import close_http_client
+from app.scraper.serper_keys import close_serper_client
+from app.services.job_service import flush_pending_writes
 
 FRONTEND_DIR = Path(__file__).resolve().parent.parent / "frontend"
 
@@ -17,6 +20,9 @@ async def lifespan(app: FastAPI):
     await init_db()
     await cleanup_stale_jobs()
     yield
+    await flush_pending_writes()
+    await close_http_client()
+    await close_serper_client()
 
 
 app = FastAPI(title="Lead Scraper", version="1.0.0", lifespan=lifespan)
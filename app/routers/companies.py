@@ -24,14 +24,25 @@ async def list_companies(
     revenue_bracket: str | None = None,
     sort_by: str = "created_at",
     sort_dir: str = "desc",
+    cursor: str | None = None,
+    skip_count: bool = False,
     db: AsyncSession = Depends(get_db),
 ):
-    return await company_service.get_companies(
-        db, page=page, per_page=per_page, search=search,
-        industry=industry, state=state, city=city,
-        revenue_bracket=revenue_bracket,
-        sort_by=sort_by, sort_dir=sort_dir,
-    )
+    try:
+        return await company_service.get_companies(
+            db, page=page, per_page=per_page, search=search,
+            industry=industry, state=state, city=city,
+            revenue_bracket=revenue_bracket,
+            sort_by=sort_by, sort_dir=sort_dir, cursor=cursor,
+            skip_count=skip_count,
+        )
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+
+
+@router.get("/filter-options")
+async def list_filter_options(db: AsyncSession = Depends(get_db)):
+    return await company_service.get_filter_options(db)
 
 
 @router.get("/industries")
@@ -54,7 +65,6 @@ async def get_company(company_id: int, db: AsyncSession = Depends(get_db)):
     company = await company_service.get_company(db, company_id)
     if not company:
         raise HTTPException(404, "Company not found")
-    company.contact_count = len(company.contacts)
     return company
 
 
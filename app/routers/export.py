@@ -1,9 +1,8 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter
 from fastapi.responses import StreamingResponse
-from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.database import get_db
-from app.services.export_service import export_companies_csv
+from app.db.database import async_session
+from app.services.export_service import export_companies_csv_stream
 
 router = APIRouter()
 
@@ -12,11 +11,15 @@ router = APIRouter()
 async def download_csv(
     industry: str | None = None,
     state: str | None = None,
-    db: AsyncSession = Depends(get_db),
 ):
-    csv_content = await export_companies_csv(db, industry=industry, state=state)
+    # The stream outlives the request's dependencies, so it owns its session
+    async def stream():
+        async with async_session() as db:
+            async for chunk in export_companies_csv_stream(db, industry=industry, state=state):
+                yield chunk
+
     return StreamingResponse(
-        iter([csv_content]),
+        stream(),
         media_type="text/csv",
         headers={"Content-Disposition": "attachment; filename=leads_export.csv"},
     )
@@ -54,7 +54,8 @@ class CompanyOut(CompanyBase):
 
 class CompanyList(BaseModel):
     items: list[CompanyOut]
-    total: int
+    total: int | None  # None when the count was skipped
     page: int
     per_page: int
-    pages: int
+    pages: int | None
+    next_cursor: str | None = None
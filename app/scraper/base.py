@@ -1,6 +1,9 @@
+import asyncio
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 
+from app.config import settings
+
 
 @dataclass
 class ScrapedContact:
@@ -56,3 +59,19 @@ class BaseScraper(ABC):
     @abstractmethod
     async def scrape_company(self, result: dict | str) -> ScrapedCompany | None:
         """Scrape company info from a search result dict or URL string."""
+
+    async def scrape_many(
+        self, results: list[dict | str], concurrency: int | None = None
+    ) -> list[ScrapedCompany | None | BaseException]:
+        """Scrape several results concurrently, at most `concurrency` at a time.
+
+        Returns one entry per input, in order; failures are returned as the
+        raised exception rather than propagated.
+        """
+        sem = asyncio.Semaphore(concurrency or settings.max_concurrent_requests)
+
+        async def _one(result: dict | str) -> ScrapedCompany | None:
+            async with sem:
+                return await self.scrape_company(result)
+
+        return await asyncio.gather(*[_one(r) for r in results], return_exceptions=True)
@@ -2,7 +2,6 @@ import asyncio
 import json
 import logging
 import re
-from urllib.parse import urlparse
 
 import httpx
 
@@ -21,6 +20,7 @@ from app.scraper.sources.google_search import GoogleSearchScraper
 from app.scraper.sources.thomasnet import ThomasNetScraper
 from app.scraper.sources.kompass import KompassScraper
 from app.scraper.sources.industrynet import IndustryNetScraper
+from app.scraper.urls import parse_netloc, parse_url
 from app.services import company_service, contact_service, job_service
 
 logger = logging.getLogger(__name__)
@@ -211,6 +211,8 @@ async def _run_job(job_id: int):
             logger.exception(f"Job {job_id} failed")
             await job_service.update_job_status(db, job_id, "failed")
             await job_service.add_log(db, job_id, "error", f"Job failed: {e}")
+        finally:
+            await job_service.flush_pending_writes()
 
 
 async def _phase_discovery(db, job_id: int, industries: list[str], sources: list[str] | None = None, location: str = ""):
@@ -262,7 +264,7 @@ async def _phase_discovery(db, job_id: int, industries: list[str], sources: list
                     for r in results:
                         domain = r.get("domain", "")
                         if not domain:
-                            domain = urlparse(r["url"]).netloc.lower().removeprefix("www.")
+                            _, domain = parse_netloc(r["url"])
                         if domain not in seen_domains:
                             seen_domains.add(domain)
                             new_results.append(r)
@@ -276,7 +278,7 @@ async def _phase_discovery(db, job_id: int, industries: list[str], sources: list
                             # Build ScrapedCompany directly from search result — no HTTP fetch
                             domain = r.get("domain", "")
                             if not domain:
-                                domain = urlparse(r["url"]).netloc.lower().removeprefix("www.")
+                                _, domain = parse_netloc(r["url"])
                             url = r["url"]
                             title = r.get("title", "")
                             snippet = r.get("snippet", "")
@@ -298,7 +300,7 @@ async def _phase_discovery(db, job_id: int, industries: list[str], sources: list
                             company_data = ScrapedCompany(
                                 name=name,
                                 domain=domain,
-                                website=f"{urlparse(url).scheme}://{urlparse(url).netloc}",
+                                website=f"{parse_url(url).scheme}://{parse_url(url).netloc}",
                                 industry=industry,
                                 description=snippet,
                                 source="google_search",
@@ -358,41 +360,49 @@ async def _phase_discovery(db, job_id: int, industries: list[str], sources: list
                 if not results:
                     continue
 
-                for result in results:
+                # Fetch profiles/websites one concurrency-sized chunk at a time, then save
+                # in order; checking between chunks keeps pause/cancel prompt
+                chunk_size = settings.max_concurrent_requests
+                for chunk_start in range(0, len(results), chunk_size):
                     await _check_job_status(db, job_id)
-                    try:
-                        company_data = await dir_scraper.scrape_company(result)
-                        processed += 1
-
-                        if company_data and company_data.name and company_data.domain:
-                            # Skip duplicates
-                            domain = company_data.domain.lower().removeprefix("www.")
-                            if domain in seen_domains:
-                                continue
-                            seen_domains.add(domain)
+                    scraped = await dir_scraper.scrape_many(results[chunk_start:chunk_start + chunk_size])
 
-                            if await company_service.get_company_by_domain(db, domain):
-                                continue
+                    for company_data in scraped:
+                        await _check_job_status(db, job_id)
+                        try:
+                            if isinstance(company_data, BaseException):
+                                raise company_data
+                            processed += 1
 
-                            company_data.industry = industry
-                            saved = await _save_company(db, job_id, company_data)
-                            if saved:
-                                if location and not _location_matches(saved.state, saved.city, location):
-                                    await db.delete(saved)
-                                    await db.commit()
+                            if company_data and company_data.name and company_data.domain:
+                                # Skip duplicates
+                                domain = company_data.domain.lower().removeprefix("www.")
+                                if domain in seen_domains:
                                     continue
-                                companies_found += 1
-                                dir_found += 1
-
-                        await job_service.update_job_progress(
-                            db, job_id,
-                            processed_urls=processed,
-                            companies_found=companies_found,
-                            errors_count=errors,
-                        )
-                    except Exception as e:
-                        errors += 1
-                        processed += 1
+                                seen_domains.add(domain)
+
+                                if await company_service.get_company_by_domain(db, domain):
+                                    continue
+
+                                company_data.industry = industry
+                                saved = await _save_company(db, job_id, company_data)
+                                if saved:
+                                    if location and not _location_matches(saved.state, saved.city, location):
+                                        await db.delete(saved)
+                                        await db.commit()
+                                        continue
+                                    companies_found += 1
+                                    dir_found += 1
+
+                            await job_service.update_job_progress(
+                                db, job_id,
+                                processed_urls=processed,
+                                companies_found=companies_found,
+                                errors_count=errors,
+                            )
+                        except Exception as e:
+                            errors += 1
+                            processed += 1
 
             except Exception as e:
                 await job_service.add_log(db, job_id, "warning", f"{source_name} search failed: {e}")
@@ -22,15 +22,45 @@ class HttpClient:
             delay_min=settings.default_delay_min,
             delay_max=settings.default_delay_max,
         )
-        self.robots_checker = RobotsChecker()
         self.max_retries = settings.max_retries
         self.timeout = settings.request_timeout
         self.respect_robots = settings.respect_robots_txt
+        # One pooled client for all page and robots.txt fetches so keep-alive connections
+        # are reused; HTTP/2 lets concurrent fetches to one directory host share a connection
+        self._client = httpx.AsyncClient(
+            timeout=self.timeout,
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=30, max_connections=100),
+        )
+        self.robots_checker = RobotsChecker(self._client)
 
     def _random_ua(self) -> str:
         return random.choice(USER_AGENTS)
 
-    async def get(self, url: str, follow_redirects: bool = True) -> httpx.Response | None:
+    @staticmethod
+    async def _read_capped(resp: httpx.Response, max_bytes: int) -> httpx.Response:
+        """Read at most max_bytes of a streamed body into a regular Response."""
+        buf = bytearray()
+        async for chunk in resp.aiter_bytes():
+            buf.extend(chunk)
+            if len(buf) >= max_bytes:
+                break
+        del buf[max_bytes:]
+        # Body is already decompressed; drop headers that describe the wire format
+        headers = [
+            (k, v) for k, v in resp.headers.multi_items()
+            if k.lower() not in ("content-encoding", "content-length")
+        ]
+        return httpx.Response(resp.status_code, headers=headers, content=bytes(buf), request=resp.request)
+
+    async def get(
+        self, url: str, follow_redirects: bool = True, max_bytes: int | None = None
+    ) -> httpx.Response | None:
+        """GET with robots.txt, rate limiting and retries.
+
+        With max_bytes, the body is streamed and reading stops once that many
+        bytes have arrived; the returned response holds only that prefix.
+        """
         if self.respect_robots:
             allowed = await self.robots_checker.is_allowed(url)
             if not allowed:
@@ -40,18 +70,20 @@ class HttpClient:
 
         for attempt in range(self.max_retries):
             try:
-                async with httpx.AsyncClient(
-                    timeout=self.timeout,
-                    follow_redirects=follow_redirects,
-                    headers={
-                        "User-Agent": self._random_ua(),
-                        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-                        "Accept-Language": "en-US,en;q=0.9",
-                    },
-                ) as client:
-                    resp = await client.get(url)
+                headers = {
+                    "User-Agent": self._random_ua(),
+                    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+                    "Accept-Language": "en-US,en;q=0.9",
+                }
+                if max_bytes is None:
+                    resp = await self._client.get(url, headers=headers, follow_redirects=follow_redirects)
                     resp.raise_for_status()
                     return resp
+                async with self._client.stream(
+                    "GET", url, headers=headers, follow_redirects=follow_redirects
+                ) as resp:
+                    resp.raise_for_status()
+                    return await self._read_capped(resp, max_bytes)
             except httpx.HTTPStatusError as e:
                 if e.response.status_code in (403, 404, 410):
                     return None
@@ -64,3 +96,24 @@ class HttpClient:
                     await asyncio.sleep(backoff)
 
         return None
+
+    async def aclose(self):
+        await self._client.aclose()
+
+
+_http_client: HttpClient | None = None
+
+
+def get_http_client() -> HttpClient:
+    """Process-wide HttpClient, so every scraper shares one connection pool,
+    rate limiter and robots.txt cache."""
+    global _http_client
+    if _http_client is None:
+        _http_client = HttpClient()
+    return _http_client
+
+
+async def close_http_client():
+    """Close the shared HttpClient's connections. Called on app shutdown."""
+    if _http_client is not None:
+        await _http_client.aclose()
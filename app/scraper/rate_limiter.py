@@ -10,27 +10,20 @@ class RateLimiter:
     def __init__(self, delay_min: float = 1.0, delay_max: float = 3.0):
         self.delay_min = delay_min
         self.delay_max = delay_max
-        self._last_request: dict[str, float] = {}
-        self._locks: dict[str, asyncio.Lock] = {}
+        # Next free request slot per domain (monotonic clock)
+        self._next_available: dict[str, float] = {}
 
     def _get_domain(self, url: str) -> str:
         return urlparse(url).netloc.lower()
 
-    def _get_lock(self, domain: str) -> asyncio.Lock:
-        if domain not in self._locks:
-            self._locks[domain] = asyncio.Lock()
-        return self._locks[domain]
-
     async def acquire(self, url: str):
+        # No lock needed: slot reservation has no await, so it runs atomically
+        # on the event loop and concurrent waiters get sequential slots.
         domain = self._get_domain(url)
-        lock = self._get_lock(domain)
-        async with lock:
-            now = time.monotonic()
-            last = self._last_request.get(domain, 0)
-            min_interval = random.uniform(self.delay_min, self.delay_max)
-            elapsed = now - last
-
-            if elapsed < min_interval:
-                await asyncio.sleep(min_interval - elapsed)
+        now = time.monotonic()
+        slot = max(now, self._next_available.get(domain, 0))
+        self._next_available[domain] = slot + random.uniform(self.delay_min, self.delay_max)
 
-            self._last_request[domain] = time.monotonic()
+        wait = slot - now
+        if wait > 0:
+            await asyncio.sleep(wait)
@@ -1,3 +1,4 @@
+import asyncio
 import time
 from urllib.parse import urlparse
 from urllib.robotparser import RobotFileParser
@@ -5,41 +6,78 @@ from urllib.robotparser import RobotFileParser
 import httpx
 
 
+def _iter_lines(buf: bytearray):
+    """Yield decoded lines one at a time instead of building a full str and line list."""
+    start = 0
+    size = len(buf)
+    while start < size:
+        end = buf.find(b"\n", start)
+        if end == -1:
+            end = size
+        yield buf[start:end].decode("utf-8", errors="replace").rstrip("\r")
+        start = end + 1
+
+
 class RobotsChecker:
     CACHE_TTL = 86400  # 24 hours
+    FAILURE_TTL = 300  # 5 minutes for non-200 / unreachable robots.txt
+    MAX_BYTES = 500_000  # Google ignores anything past 500KB too
 
-    def __init__(self):
+    def __init__(self, client: httpx.AsyncClient):
+        # Fetch through the owning HttpClient's pool so robots.txt and page
+        # requests to the same host share connections
+        self._client = client
+        # domain -> (parser, expires_at)
         self._cache: dict[str, tuple[RobotFileParser, float]] = {}
+        # domain -> in-progress fetch, shared by concurrent callers
+        self._inflight: dict[str, asyncio.Task] = {}
 
     def _get_robots_url(self, url: str) -> str:
         parsed = urlparse(url)
         return f"{parsed.scheme}://{parsed.netloc}/robots.txt"
 
-    async def _fetch_robots(self, robots_url: str) -> RobotFileParser:
+    async def _fetch_robots(self, robots_url: str) -> tuple[RobotFileParser, int]:
+        """Fetch and parse robots.txt. Returns (parser, cache ttl in seconds)."""
         parser = RobotFileParser()
         parser.set_url(robots_url)
         try:
-            async with httpx.AsyncClient(timeout=10, follow_redirects=True) as client:
-                resp = await client.get(robots_url)
+            async with self._client.stream("GET", robots_url, timeout=10, follow_redirects=True) as resp:
                 if resp.status_code == 200:
-                    parser.parse(resp.text.splitlines())
-                else:
-                    parser.allow_all = True
+                    # Stop reading at MAX_BYTES so oversized files can't blow up memory/parse time
+                    buf = bytearray()
+                    async for chunk in resp.aiter_bytes():
+                        buf.extend(chunk)
+                        if len(buf) >= self.MAX_BYTES:
+                            break
+                    del buf[self.MAX_BYTES:]
+                    parser.parse(_iter_lines(buf))
+                    return parser, self.CACHE_TTL
         except Exception:
-            parser.allow_all = True
+            pass
+        parser.allow_all = True
+        return parser, self.FAILURE_TTL
+
+    async def _load(self, domain: str, url: str) -> RobotFileParser:
+        parser, ttl = await self._fetch_robots(self._get_robots_url(url))
+        self._cache[domain] = (parser, time.time() + ttl)
         return parser
 
+    async def _get_parser(self, domain: str, url: str) -> RobotFileParser:
+        cached = self._cache.get(domain)
+        if cached and time.time() < cached[1]:
+            return cached[0]
+
+        # Coalesce concurrent lookups for the same domain into one fetch
+        task = self._inflight.get(domain)
+        if task is None:
+            task = asyncio.create_task(self._load(domain, url))
+            self._inflight[domain] = task
+            task.add_done_callback(lambda _: self._inflight.pop(domain, None))
+        # Shield so one cancelled caller doesn't cancel the fetch for the others
+        return await asyncio.shield(task)
+
     async def is_allowed(self, url: str, user_agent: str = "*") -> bool:
         parsed = urlparse(url)
         domain = parsed.netloc.lower()
-
-        # Check cache
-        if domain in self._cache:
-            parser, cached_at = self._cache[domain]
-            if time.time() - cached_at < self.CACHE_TTL:
-                return parser.can_fetch(user_agent, url)
-
-        robots_url = self._get_robots_url(url)
-        parser = await self._fetch_robots(robots_url)
-        self._cache[domain] = (parser, time.time())
+        parser = await self._get_parser(domain, url)
         return parser.can_fetch(user_agent, url)
@@ -4,8 +4,9 @@ Supports unlimited comma-separated keys in SCRAPER_SERP_API_KEY env var.
 Automatically rotates to the next key when one is exhausted (403/429).
 """
 
+import asyncio
 import logging
-import threading
+import time
 
 import httpx
 
@@ -13,14 +14,27 @@ from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Every Serper call goes to the same host, so one long-lived HTTP/2 client
+# multiplexes concurrent searches/balance checks over a single connection.
+_serper_client = httpx.AsyncClient(
+    base_url="https://google.serper.dev",
+    http2=True,
+    timeout=15,
+    limits=httpx.Limits(max_keepalive_connections=4),
+)
+
 
 class SerperKeyManager:
+    # Cap in-flight searches per key so a burst can't pile doomed requests
+    # onto a key before its exhaustion (403/429) is observed
+    MAX_CONCURRENT_PER_KEY = 8
+
     def __init__(self):
         raw = settings.serp_api_key or ""
         self._keys = [k.strip() for k in raw.split(",") if k.strip()]
         self._index = 0
-        self._lock = threading.Lock()
         self._exhausted: set[int] = set()
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
         if self._keys:
             logger.info(f"Serper key manager initialized with {len(self._keys)} key(s)")
 
@@ -40,22 +54,32 @@ class SerperKeyManager:
         """Get the current active API key."""
         if not self._keys:
             return ""
-        with self._lock:
-            # If current key is exhausted, find next available
-            if self._index in self._exhausted:
-                self._rotate()
-            return self._keys[self._index] if self._index < len(self._keys) else ""
-
-    def mark_exhausted(self):
-        """Mark the current key as exhausted and rotate to next."""
+        # No lock needed: callers share one event loop and nothing here awaits
+        if self._index in self._exhausted:
+            self._rotate()
+        return self._keys[self._index] if self._index < len(self._keys) else ""
+
+    def semaphore(self, key: str) -> asyncio.Semaphore:
+        """Per-key concurrency limiter, created lazily on first use."""
+        sem = self._semaphores.get(key)
+        if sem is None:
+            sem = self._semaphores[key] = asyncio.Semaphore(self.MAX_CONCURRENT_PER_KEY)
+        return sem
+
+    def mark_exhausted(self, key: str | None = None):
+        """Mark a key (default: the current one) as exhausted and rotate to next."""
         if not self._keys:
             return
-        with self._lock:
-            self._exhausted.add(self._index)
-            logger.warning(
-                f"Serper key #{self._index + 1} exhausted. "
-                f"{self.active_keys}/{self.total_keys} keys remaining."
-            )
+        index = self._keys.index(key) if key in self._keys else self._index
+        # Concurrent requests on the same key can all report it; only count it once
+        if index in self._exhausted:
+            return
+        self._exhausted.add(index)
+        logger.warning(
+            f"Serper key #{index + 1} exhausted. "
+            f"{self.active_keys}/{self.total_keys} keys remaining."
+        )
+        if index == self._index:
             self._rotate()
 
     def _rotate(self):
@@ -74,36 +98,36 @@ class SerperKeyManager:
 
     def reset(self):
         """Reset all keys to active (e.g. on new day/billing cycle)."""
-        with self._lock:
-            self._exhausted.clear()
-            self._index = 0
+        self._exhausted.clear()
+        self._index = 0
 
     async def get_all_balances(self) -> list[dict]:
-        """Check credit balance for all keys."""
-        balances = []
-        for i, key in enumerate(self._keys):
+        """Check credit balance for all keys (queried concurrently)."""
+
+        async def _balance(i: int, key: str) -> dict:
             try:
-                async with httpx.AsyncClient(timeout=10) as client:
-                    resp = await client.get(
-                        "https://google.serper.dev/account",
-                        headers={"X-API-KEY": key},
-                    )
-                    resp.raise_for_status()
-                    data = resp.json()
-                    credit = data.get("credit", data.get("balance", 0))
-                    balances.append({
-                        "key_index": i + 1,
-                        "credit": credit,
-                        "exhausted": i in self._exhausted,
-                    })
+                resp = await _serper_client.get(
+                    "/account",
+                    headers={"X-API-KEY": key},
+                    timeout=10,
+                )
+                resp.raise_for_status()
+                data = resp.json()
+                credit = data.get("credit", data.get("balance", 0))
+                return {
+                    "key_index": i + 1,
+                    "credit": credit,
+                    "exhausted": i in self._exhausted,
+                }
             except Exception as e:
-                balances.append({
+                return {
                     "key_index": i + 1,
                     "credit": 0,
                     "exhausted": True,
                     "error": str(e),
-                })
-        return balances
+                }
+
+        return list(await asyncio.gather(*[_balance(i, key) for i, key in enumerate(self._keys)]))
 
     async def get_total_balance(self) -> int:
         """Get sum of credits across all keys."""
@@ -111,45 +135,62 @@ class SerperKeyManager:
         return sum(b.get("credit", 0) for b in balances)
 
 
+# Identical queries recur across sources (e.g. the same company name looked up
+# by several directory scrapers); cache responses to save credits and latency.
+SEARCH_CACHE_TTL = 3600  # 1 hour
+SEARCH_CACHE_MAX = 4096
+_search_cache: dict[tuple, tuple[dict, float]] = {}  # key -> (response, expires_at)
+
+
 async def serper_search(query: str, num: int = 10, gl: str = "us", location: str = "") -> dict | None:
     """Make a Serper search request with automatic key rotation."""
     if not key_manager.has_keys:
         return None
-    if key_manager.active_keys == 0:
-        return None
-
-    key = key_manager.get_key()
-    if not key:
-        return None
 
-    try:
-        payload = {"q": query, "num": num, "gl": gl}
-        if location:
-            payload["location"] = location
-        async with httpx.AsyncClient(timeout=15) as client:
-            resp = await client.post(
-                "https://google.serper.dev/search",
-                json=payload,
-                headers={"X-API-KEY": key},
-            )
+    cache_key = (query, num, gl, location)
+    cached = _search_cache.get(cache_key)
+    if cached and time.monotonic() < cached[1]:
+        return cached[0]
+
+    payload = {"q": query, "num": num, "gl": gl}
+    if location:
+        payload["location"] = location
+
+    # At most one attempt per key; each exhausted key rotates to the next
+    for attempt in range(key_manager.total_keys):
+        if key_manager.active_keys == 0:
+            return None
+        key = key_manager.get_key()
+        if not key:
+            return None
+        if attempt:
+            await asyncio.sleep(min(2 ** attempt * 0.1, 5))
+
+        try:
+            async with key_manager.semaphore(key):
+                resp = await _serper_client.post(
+                    "/search",
+                    json=payload,
+                    headers={"X-API-KEY": key},
+                )
             # Serper returns 400 "Not enough credits", 403, or 429 when exhausted
-            if resp.status_code in (400, 403, 429):
-                body = resp.text.lower()
-                if "credit" in body or resp.status_code in (403, 429):
-                    key_manager.mark_exhausted()
-                    if key_manager.active_keys > 0:
-                        return await serper_search(query, num, gl)
-                    return None
+            if resp.status_code in (403, 429) or (
+                resp.status_code == 400 and "credit" in resp.text.lower()
+            ):
+                key_manager.mark_exhausted(key)
+                continue
             resp.raise_for_status()
-            return resp.json()
-    except httpx.HTTPStatusError as e:
-        if e.response.status_code in (400, 403, 429):
-            key_manager.mark_exhausted()
-            if key_manager.active_keys > 0:
-                return await serper_search(query, num, gl)
-        return None
-    except Exception:
-        return None
+            data = resp.json()
+        except Exception:
+            return None
+
+        _search_cache.pop(cache_key, None)  # re-insert expired keys at the end
+        _search_cache[cache_key] = (data, time.monotonic() + SEARCH_CACHE_TTL)
+        if len(_search_cache) > SEARCH_CACHE_MAX:
+            # Dicts keep insertion order, so the first entry is the oldest
+            _search_cache.pop(next(iter(_search_cache)))
+        return data
+    return None
 
 
 async def serper_account(key: str | None = None) -> dict | None:
@@ -158,16 +199,21 @@ async def serper_account(key: str | None = None) -> dict | None:
     if not k:
         return None
     try:
-        async with httpx.AsyncClient(timeout=10) as client:
-            resp = await client.get(
-                "https://google.serper.dev/account",
-                headers={"X-API-KEY": k},
-            )
-            resp.raise_for_status()
-            return resp.json()
+        resp = await _serper_client.get(
+            "/account",
+            headers={"X-API-KEY": k},
+            timeout=10,
+        )
+        resp.raise_for_status()
+        return resp.json()
     except Exception:
         return None
 
 
+async def close_serper_client():
+    """Close the pooled Serper connection. Called on app shutdown."""
+    await _serper_client.aclose()
+
+
 # Singleton instance
 key_manager = SerperKeyManager()
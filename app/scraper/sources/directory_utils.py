@@ -1,31 +1,66 @@
-"""Shared utilities for directory scrapers (ThomasNet, Kompass, IndustryNet)."""
+"""Shared base class and utilities for directory scrapers (ThomasNet, Kompass, IndustryNet)."""
 
 import re
-from urllib.parse import urlparse
+from collections import OrderedDict
 
-from app.scraper.serper_keys import serper_search
+from app.scraper.base import BaseScraper, ScrapedCompany
+from app.scraper.extractors.company_extractor import extract_company
+from app.scraper.http_client import get_http_client
+from app.scraper.serper_keys import key_manager, serper_search
+from app.scraper.urls import parse_netloc, parse_url
 
-SOCIAL_DOMAINS = {
+SOCIAL_DOMAINS = frozenset({
     "wikipedia.org", "youtube.com", "facebook.com", "twitter.com",
     "linkedin.com", "instagram.com", "reddit.com", "yelp.com",
     "indeed.com", "glassdoor.com", "bbb.org", "crunchbase.com",
     "thomasnet.com", "kompass.com", "industrynet.com",
     "bloomberg.com", "reuters.com", "forbes.com",
     "amazon.com", "ebay.com", "google.com", "yahoo.com",
-}
+})
 
-US_STATES = {
+US_STATES = frozenset({
     "AL", "AK", "AZ", "AR", "CA", "CO", "CT", "DE", "FL", "GA",
     "HI", "ID", "IL", "IN", "IA", "KS", "KY", "LA", "ME", "MD",
     "MA", "MI", "MN", "MS", "MO", "MT", "NE", "NV", "NH", "NJ",
     "NM", "NY", "NC", "ND", "OH", "OK", "OR", "PA", "RI", "SC",
     "SD", "TN", "TX", "UT", "VT", "VA", "WA", "WV", "WI", "WY", "DC",
-}
+})
+
+# "City, ST" where ST must be a real state code, so the regex itself rejects
+# non-state pairs and keeps scanning instead of a post-match set check
+_STATES_PAT = "|".join(sorted(US_STATES))
+_CITY_STATE = re.compile(rf"([A-Z][a-z]+(?:\s[A-Z][a-z]+)*),\s*({_STATES_PAT})\b")
+
+# Title separators, checked in order; the name is the part before the first found
+_TITLE_SEPS = (" - ", " | ", " — ", " – ")
+
+
+def _build_suffix_trie(domains: frozenset[str]) -> dict:
+    """Nested dict keyed by reversed labels: {"com": {"facebook": {"$": True}}}."""
+    trie: dict = {}
+    for d in domains:
+        node = trie
+        for label in reversed(d.split(".")):
+            node = node.setdefault(label, {})
+        node["$"] = True
+    return trie
+
+
+_SOCIAL_TRIE = _build_suffix_trie(SOCIAL_DOMAINS)
 
 
 def is_social_domain(domain: str) -> bool:
-    for d in SOCIAL_DOMAINS:
-        if domain == d or domain.endswith(f".{d}"):
+    # Exact matches are the common case: one hash lookup
+    if domain in SOCIAL_DOMAINS:
+        return True
+    # Otherwise walk labels right-to-left; hitting a terminal means the domain
+    # is a subdomain of a listed one (e.g. "m.facebook.com").
+    node = _SOCIAL_TRIE
+    for label in reversed(domain.split(".")):
+        node = node.get(label)
+        if node is None:
+            return False
+        if "$" in node:
             return True
     return False
 
@@ -49,6 +84,12 @@ _STREET_SUFFIX = re.compile(
     r',\s+[\w\s]+\b(?:Street|Road|Drive|Avenue|Ave|Blvd|Boulevard|Lane|Way|Place|Rd|St|Dr|Ct|Circle|Highway|Hwy)\b.*$',
     re.IGNORECASE,
 )
+_TRAILING_ELLIPSIS = re.compile(r'\.{2,}\s*$')
+_TRAILING_PUNCT = re.compile(r'[:.]+\s*$')
+_LEADING_SYMBOLS = re.compile(r'^[^\w\s]+\s*')
+_NAME_LOCATION = re.compile(r"[A-Z][a-z]+.*,\s*[A-Z]{2}")
+_URL = re.compile(r"(https?://[a-zA-Z0-9.-]+\.[a-z]{2,})")
+_BARE_DOMAIN = re.compile(r"\b((?:www\.)?[a-zA-Z0-9-]+\.[a-z]{2,}(?:\.[a-z]{2,})?)\b")
 
 
 def _strip_address(name: str) -> str:
@@ -63,7 +104,7 @@ def _strip_address(name: str) -> str:
     if m:
         name = name[:m.start()].strip()
     # Remove trailing ellipsis
-    name = re.sub(r'\.{2,}\s*$', '', name).strip()
+    name = _TRAILING_ELLIPSIS.sub('', name).strip()
     return name
 
 
@@ -77,48 +118,64 @@ def extract_name_from_title(title: str) -> str:
     """
     if not title:
         return ""
-    for sep in [" - ", " | ", " — ", " – "]:
-        if sep in title:
-            title = title.split(sep)[0]
+    for sep in _TITLE_SEPS:
+        idx = title.find(sep)
+        if idx != -1:
+            title = title[:idx]
             break
     if ": " in title:
         parts = title.split(": ", 1)
         after = parts[1].strip()
-        if re.match(r"[A-Z][a-z]+.*,\s*[A-Z]{2}", after):
+        if _NAME_LOCATION.match(after):
             title = parts[0]
     # Strip address fragments (Kompass embeds addresses in titles)
     title = _strip_address(title)
     # Remove trailing colons and unicode symbols
-    title = re.sub(r'[:.]+\s*$', '', title).strip()
-    title = re.sub(r'^[^\w\s]+\s*', '', title).strip()
+    title = _TRAILING_PUNCT.sub('', title).strip()
+    title = _LEADING_SYMBOLS.sub('', title).strip()
     name = title.strip()
     return name[:200] if len(name) >= 2 else ""
 
 
 def extract_location_from_snippet(snippet: str) -> tuple[str, str]:
     """Try to extract city, state from a snippet."""
-    match = re.search(r"([A-Z][a-z]+(?:\s[A-Z][a-z]+)*),\s*([A-Z]{2})\b", snippet)
-    if match and match.group(2) in US_STATES:
+    match = _CITY_STATE.search(snippet)
+    if match:
         return match.group(1).strip(), match.group(2)
     return "", ""
 
 
+def find_href_url(html: str, pattern: re.Pattern) -> re.Match | None:
+    """Return the first match of `pattern` anchored at an href= attribute.
+
+    Jumps between href= positions with str.find and only runs the regex
+    there, instead of searching every byte of the page.
+    """
+    pos = html.find("href=")
+    while pos != -1:
+        m = pattern.match(html, pos)
+        if m:
+            return m
+        pos = html.find("href=", pos + 5)
+    return None
+
+
 def extract_domain_from_snippet(snippet: str, exclude_domain: str) -> tuple[str, str]:
     """Try to extract a company domain/website URL from a snippet.
 
     Returns (domain, website_url) or ("", "").
     """
     # Look for URLs in the snippet text
-    url_match = re.search(r"(https?://[a-zA-Z0-9.-]+\.[a-z]{2,})", snippet)
+    url_match = _URL.search(snippet)
     if url_match:
         url = url_match.group(1)
-        parsed = urlparse(url)
-        domain = parsed.netloc.lower().removeprefix("www.")
+        parsed = parse_url(url)
+        _, domain = parse_netloc(url)
         if domain and "." in domain and domain != exclude_domain and not is_social_domain(domain):
             return domain, f"{parsed.scheme}://{parsed.netloc}"
 
     # Look for bare domain patterns like "www.example.com" or "example.com"
-    domain_match = re.search(r"\b((?:www\.)?[a-zA-Z0-9-]+\.[a-z]{2,}(?:\.[a-z]{2,})?)\b", snippet)
+    domain_match = _BARE_DOMAIN.search(snippet)
     if domain_match:
         domain = domain_match.group(1).lower().removeprefix("www.")
         if domain and domain != exclude_domain and not is_social_domain(domain):
@@ -127,20 +184,180 @@ def extract_domain_from_snippet(snippet: str, exclude_domain: str) -> tuple[str,
     return "", ""
 
 
+# Company name -> (domain, website_url); names recur across directory sources
+_WEBSITE_CACHE_MAX = 4096
+_website_cache: OrderedDict[str, tuple[str, str]] = OrderedDict()
+
+
 async def find_company_website(name: str) -> tuple[str, str]:
     """Use a quick Google search to find the company's website.
 
-    Returns (domain, website_url) or ("", "").
+    Returns (domain, website_url) or ("", ""). Answers are cached per name
+    (LRU), including "not found"; failed searches are not cached.
     """
+    cached = _website_cache.get(name)
+    if cached is not None:
+        _website_cache.move_to_end(name)
+        return cached
+
     data = await serper_search(f"{name} official website", num=3)
     if not data:
         return "", ""
+    result = ("", "")
     for r in data.get("organic", []):
         link = r.get("link", "")
         if not link:
             continue
-        parsed = urlparse(link)
-        domain = parsed.netloc.lower().removeprefix("www.")
+        parsed = parse_url(link)
+        _, domain = parse_netloc(link)
         if domain and "." in domain and not is_social_domain(domain):
-            return domain, f"{parsed.scheme}://{parsed.netloc}"
-    return "", ""
+            result = (domain, f"{parsed.scheme}://{parsed.netloc}")
+            break
+
+    _website_cache[name] = result
+    if len(_website_cache) > _WEBSITE_CACHE_MAX:
+        _website_cache.popitem(last=False)
+    return result
+
+
+# Company homepages carry name/description/phone/location near the top;
+# reading past this just costs bandwidth and extractor regex time
+COMPANY_PAGE_MAX_BYTES = 131_072
+
+
+class DirectoryScraperBase(BaseScraper):
+    """Find companies listed on a B2B directory via Google site: search,
+    then scrape the company's own website for details.
+
+    Subclasses only configure the directory: its domain, the path segment
+    that marks a company profile URL, and the Serper query template.
+    """
+
+    SITE_DOMAIN: str = ""
+    PATH_MARKER: str = ""
+    SEARCH_QUERY_TEMPLATE: str = ""  # formatted with {query}
+    _WEBSITE_RE: re.Pattern
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.SITE_DOMAIN:
+            # First off-site URL on a profile page — usually the company's own website
+            cls._WEBSITE_RE = re.compile(
+                rf'(?:href=["\'])?(https?://(?!(?:www\.)?{re.escape(cls.SITE_DOMAIN)})'
+                r'[a-zA-Z0-9.-]+\.[a-z]{2,}[^"\'<>\s]*)'
+            )
+
+    def __init__(self):
+        self.http = get_http_client()
+
+    async def search(self, query: str, num_results: int = 10) -> list[dict]:
+        """Search Google for company profiles on this directory."""
+        if not key_manager.has_keys:
+            return []
+
+        search_query = self.SEARCH_QUERY_TEMPLATE.format(query=query)
+        data = await serper_search(search_query, num=num_results)
+        if not data:
+            return []
+
+        results = []
+        for r in data.get("organic", []):
+            link = r.get("link", "")
+            if not link or self.PATH_MARKER not in link:
+                continue
+            results.append({
+                "url": link,
+                "title": r.get("title", ""),
+                "snippet": r.get("snippet", ""),
+            })
+            if len(results) >= num_results:
+                break
+        return results
+
+    async def scrape_company(self, result: dict | str) -> ScrapedCompany | None:
+        """Extract company info from a directory search result.
+
+        Parses name from title, tries to find the company's actual website,
+        then scrapes it with company_extractor for full details.
+        """
+        if isinstance(result, str):
+            return None
+
+        title = result.get("title", "")
+        snippet = result.get("snippet", "")
+        source_url = result.get("url", "")
+
+        name = extract_name_from_title(title)
+        if not name:
+            return None
+
+        # Step 1: Try to extract domain from the snippet (free — no API call)
+        company_domain, company_website = extract_domain_from_snippet(snippet, self.SITE_DOMAIN)
+
+        # Step 2: If snippet didn't have it, try scraping the profile page
+        if not company_domain:
+            try:
+                resp = await self.http.get(source_url)
+                if resp and resp.text:
+                    website_match = find_href_url(resp.text, self._WEBSITE_RE)
+                    if website_match:
+                        url = website_match.group(1)
+                        parsed = parse_url(url)
+                        _, domain = parse_netloc(url)
+                        if domain and "." in domain and not is_social_domain(domain):
+                            company_website = f"{parsed.scheme}://{parsed.netloc}"
+                            company_domain = domain
+            except Exception:
+                pass
+
+        # Step 3: Last resort — Google search (costs 1 API call)
+        if not company_domain:
+            company_domain, company_website = await find_company_website(name)
+
+        if not company_domain:
+            return None
+
+        company = ScrapedCompany(
+            name=name,
+            domain=company_domain,
+            website=company_website or "",
+            description=snippet,  # Pre-populate from search snippet
+            source=self.name,
+            source_url=source_url,
+        )
+
+        # Extract location from snippet
+        city, state = extract_location_from_snippet(snippet)
+        if city:
+            company.city = city
+        if state:
+            company.state = state
+
+        # Try scraping the company's own website for richer data
+        if company_website:
+            try:
+                resp = await self.http.get(company_website, max_bytes=COMPANY_PAGE_MAX_BYTES)
+                if resp and resp.text:
+                    scraped = extract_company(company_website, resp.text)
+                    if scraped:
+                        if scraped.description:
+                            company.description = scraped.description
+                        if scraped.phone:
+                            company.phone = scraped.phone
+                        if scraped.city and not company.city:
+                            company.city = scraped.city
+                        if scraped.state and not company.state:
+                            company.state = scraped.state
+                        if scraped.zip_code:
+                            company.zip_code = scraped.zip_code
+                        if scraped.employee_count:
+                            company.employee_count = scraped.employee_count
+                        if scraped.employee_count_range:
+                            company.employee_count_range = scraped.employee_count_range
+                        if scraped.estimated_revenue:
+                            company.estimated_revenue = scraped.estimated_revenue
+                            company.revenue_source = scraped.revenue_source
+            except Exception:
+                pass
+
+        return company
@@ -1,12 +1,19 @@
-from urllib.parse import urlparse
+import re
 
 import httpx
 
 from app.config import settings
 from app.scraper.base import BaseScraper, ScrapedCompany
-from app.scraper.filters import is_public_company_domain
-from app.scraper.http_client import HttpClient
+from app.scraper.extractors.company_extractor import extract_company
+from app.scraper.filters import has_public_company_indicators, is_public_company_domain
+from app.scraper.http_client import get_http_client
 from app.scraper.serper_keys import key_manager, serper_search
+from app.scraper.urls import parse_netloc, parse_url
+
+try:
+    from serpapi import GoogleSearch
+except ImportError:  # only needed when serp_api_provider == "serpapi"
+    GoogleSearch = None
 
 # Domains that are never actual company websites
 SKIP_DOMAINS = {
@@ -26,6 +33,8 @@ SKIP_DOMAINS = {
     "medium.com", "quora.com", "stackexchange.com",
     "pinterest.com", "tiktok.com", "tumblr.com",
 }
+# ".example.com" forms so str.endswith can check every subdomain in one C call
+_SKIP_DOT_SUFFIXES = tuple(f".{d}" for d in SKIP_DOMAINS)
 
 # URL path patterns that indicate list/article pages, not company sites
 SKIP_PATH_PATTERNS = [
@@ -33,13 +42,15 @@ SKIP_PATH_PATTERNS = [
     "/article/", "/blog/", "/news/", "/press-release/",
     "/search", "/results", "/directory",
 ]
+# All path patterns in one alternation so each path is scanned once
+_SKIP_PATH_RE = re.compile("|".join(re.escape(p) for p in SKIP_PATH_PATTERNS))
 
 
 class GoogleSearchScraper(BaseScraper):
     name = "google_search"
 
     def __init__(self):
-        self.http = HttpClient()
+        self.http = get_http_client()
 
     async def search(self, query: str, num_results: int = 10, location: str = "") -> list[dict]:
         if settings.serp_api_provider == "serpapi":
@@ -47,9 +58,9 @@ class GoogleSearchScraper(BaseScraper):
         return await self._search_serper(query, num_results, location=location)
 
     async def _search_serpapi(self, query: str, num_results: int) -> list[dict]:
+        if GoogleSearch is None:
+            return []
         try:
-            from serpapi import GoogleSearch
-
             params = {
                 "q": query,
                 "num": num_results,
@@ -62,14 +73,15 @@ class GoogleSearchScraper(BaseScraper):
             results = []
             for r in data.get("organic_results", []):
                 link = r.get("link", "")
-                if link and self._is_company_url(link):
-                    parsed = urlparse(link)
-                    domain = parsed.netloc.lower().removeprefix("www.")
+                parts = self._company_url_parts(link) if link else None
+                if parts:
+                    domain, path_depth = parts
                     results.append({
                         "url": link,
                         "title": r.get("title", ""),
                         "snippet": r.get("snippet", ""),
                         "domain": domain,
+                        "path_depth": path_depth,
                         "knowledge_graph": None,
                     })
             return results[:num_results]
@@ -85,48 +97,52 @@ class GoogleSearchScraper(BaseScraper):
         results = []
         for r in data.get("organic", []):
             link = r.get("link", "")
-            if link and self._is_company_url(link):
-                parsed = urlparse(link)
-                domain = parsed.netloc.lower().removeprefix("www.")
+            parts = self._company_url_parts(link) if link else None
+            if parts:
+                domain, path_depth = parts
                 results.append({
                     "url": link,
                     "title": r.get("title", ""),
                     "snippet": r.get("snippet", ""),
                     "domain": domain,
+                    "path_depth": path_depth,
                     "knowledge_graph": kg if not results else None,  # attach KG to first result only
                 })
         return results[:num_results]
 
-    def _is_company_url(self, url: str) -> bool:
-        parsed = urlparse(url)
-        domain = parsed.netloc.lower().removeprefix("www.")
-        path = parsed.path.lower()
+    def _company_url_parts(self, url: str) -> tuple[str, int] | None:
+        """Return (domain, path_depth) if the URL looks like a company site, else None.
 
-        # Skip known non-company domains
-        for skip in SKIP_DOMAINS:
-            if domain == skip or domain.endswith(f".{skip}"):
-                return False
+        Both are computed once here and carried in the result dict, so later
+        stages read them instead of re-parsing the URL.
+        """
+        _, domain = parse_netloc(url)
+        path = parse_url(url).path.lower()
+
+        # Skip known non-company domains and their subdomains
+        if domain in SKIP_DOMAINS or domain.endswith(_SKIP_DOT_SUFFIXES):
+            return None
 
         # Skip all government domains
         if domain.endswith(".gov"):
-            return False
+            return None
 
         # Skip public/enterprise companies
         if is_public_company_domain(domain):
-            return False
+            return None
 
         # Skip list/article URLs
-        for pattern in SKIP_PATH_PATTERNS:
-            if pattern in path:
-                return False
+        if _SKIP_PATH_RE.search(path):
+            return None
 
         # Should be a homepage or about/contact page of a company
         # Reject deep paths that are likely articles
-        path_depth = len([p for p in path.split("/") if p])
+        # Segment count without splitting: "/a/b/" -> 2 (only "//" runs overcount)
+        path_depth = path.count("/") - path.endswith("/")
         if path_depth > 3:
-            return False
+            return None
 
-        return True
+        return domain, path_depth
 
     async def scrape_company(self, result: dict | str) -> ScrapedCompany | None:
         url = result["url"] if isinstance(result, dict) else result
@@ -134,9 +150,6 @@ class GoogleSearchScraper(BaseScraper):
         if not resp:
             return None
 
-        from app.scraper.extractors.company_extractor import extract_company
-        from app.scraper.filters import has_public_company_indicators
-
         # Skip if the page looks like a public company
         if has_public_company_indicators(resp.text):
             return None
@@ -0,0 +1,21 @@
+"""Cached URL parsing shared by the scrapers.
+
+The same result URLs get parsed at several stages (filtering, domain
+extraction, scraping), so memoize the parse.
+"""
+
+from functools import lru_cache
+from urllib.parse import ParseResult, urlparse
+
+
+@lru_cache(maxsize=4096)
+def parse_url(url: str) -> ParseResult:
+    """Memoized urlparse(). ParseResult is an immutable tuple, so sharing it is safe."""
+    return urlparse(url)
+
+
+@lru_cache(maxsize=1024)
+def parse_netloc(url: str) -> tuple[str, str]:
+    """Return (scheme, domain) for a URL, with the domain lowercased and "www." stripped."""
+    parsed = parse_url(url)
+    return parsed.scheme, parsed.netloc.lower().removeprefix("www.")
@@ -1,8 +1,15 @@
-from sqlalchemy import func, select
+import asyncio
+import base64
+import json
+import re
+import time
+from datetime import datetime
+
+from sqlalchemy import event, func, insert, inspect, or_, select, text, tuple_, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import raiseload, selectinload
 
-from app.db.models import Company, Contact
+from app.db.models import Company
 from app.schemas.company import CompanyCreate, CompanyUpdate
 
 
@@ -15,13 +22,16 @@ REVENUE_BRACKETS = {
 }
 
 
+_REV_RE = re.compile(r"\$\s*([\d.]+)\s*([BMK])?", re.IGNORECASE)
+_REV_STRIP = str.maketrans("", "", "~,")
+
+
 def _parse_revenue_to_number(rev_str: str) -> float | None:
     """Convert revenue string like '$50M' or '$1.2B' to a number."""
-    import re
     if not rev_str:
         return None
-    rev_str = rev_str.replace("~", "").replace(",", "").strip()
-    m = re.match(r"\$\s*([\d.]+)\s*(B|M|K)?", rev_str, re.IGNORECASE)
+    rev_str = rev_str.translate(_REV_STRIP).strip()
+    m = _REV_RE.match(rev_str)
     if not m:
         return None
     val = float(m.group(1))
@@ -35,6 +45,124 @@ def _parse_revenue_to_number(rev_str: str) -> float | None:
     return val
 
 
+# Columns the list can be sorted by; anything else falls back to created_at
+_SORT_COLS = {
+    "created_at": Company.created_at,
+    "name": Company.name,
+    "domain": Company.domain,
+    "industry": Company.industry,
+    "employee_count": Company.employee_count,
+    "estimated_revenue": Company.estimated_revenue,
+    "city": Company.city,
+    "state": Company.state,
+}
+
+# Columns matched by the free-text search
+_ILIKE_COLS = (Company.name, Company.domain, Company.city)
+
+# Filtered totals are cached briefly; counting every match is the priciest part of a list page
+COUNT_CACHE_TTL = 30  # seconds
+COUNT_CACHE_MAX = 256
+_count_cache: dict[tuple, tuple[int, float]] = {}  # filters -> (total, expires_at)
+
+
+async def _count_companies(db: AsyncSession, query, filters_key: tuple) -> int:
+    cached = _count_cache.get(filters_key)
+    if cached and time.monotonic() < cached[1]:
+        return cached[0]
+    # Count straight off the filtered WHERE clause rather than wrapping it in a subquery
+    count_query = query.with_only_columns(func.count(Company.id)).order_by(None)
+    total = (await db.execute(count_query)).scalar() or 0
+    _count_cache.pop(filters_key, None)
+    _count_cache[filters_key] = (total, time.monotonic() + COUNT_CACHE_TTL)
+    if len(_count_cache) > COUNT_CACHE_MAX:
+        _count_cache.pop(next(iter(_count_cache)))
+    return total
+
+
+# Filter dropdown values change rarely; serve them from memory for a minute
+FILTER_OPTIONS_TTL = 60  # seconds
+_filter_options_cache: tuple[dict[str, list[str]], float] | None = None  # (options, expires_at)
+_filter_options_lock = asyncio.Lock()
+
+
+def _invalidate_list_caches() -> None:
+    """Drop cached counts and filter options after a company write."""
+    global _filter_options_cache
+    _count_cache.clear()
+    _filter_options_cache = None
+
+
+def _revenue_numeric(rev_str: str | None) -> int | None:
+    val = _parse_revenue_to_number(rev_str)
+    return int(val) if val is not None else None
+
+
+@event.listens_for(Company, "before_insert")
+def _set_revenue_numeric(mapper, connection, target: Company) -> None:
+    target.estimated_revenue_numeric = _revenue_numeric(target.estimated_revenue)
+
+
+@event.listens_for(Company, "before_update")
+def _sync_revenue_numeric(mapper, connection, target: Company) -> None:
+    # Re-parse only when the revenue string itself changed in this flush
+    if inspect(target).attrs.estimated_revenue.history.has_changes():
+        target.estimated_revenue_numeric = _revenue_numeric(target.estimated_revenue)
+
+
+async def backfill_revenue_numeric(db: AsyncSession) -> int:
+    """Populate estimated_revenue_numeric for rows written before the column existed."""
+    result = await db.execute(
+        select(Company.id, Company.estimated_revenue).where(
+            Company.estimated_revenue_numeric.is_(None),
+            Company.estimated_revenue.isnot(None),
+            Company.estimated_revenue != "",
+        )
+    )
+    rows = [
+        {"id": cid, "estimated_revenue_numeric": val}
+        for cid, rev_str in result.all()
+        if (val := _revenue_numeric(rev_str)) is not None
+    ]
+    if rows:
+        await db.execute(update(Company), rows)
+        await db.commit()
+    return len(rows)
+
+
+def _encode_cursor(sort_by: str, sort_dir: str, sort_val, company_id: int) -> str:
+    if isinstance(sort_val, datetime):
+        sort_val = sort_val.isoformat()
+    raw = json.dumps([sort_by, sort_dir, sort_val, company_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def _decode_cursor(cursor: str, sort_by: str, sort_dir: str) -> tuple:
+    """Decode a cursor into (sort_val, id); sort_val is None in the NULL tail.
+
+    Raises ValueError if the cursor is malformed or was issued for another sort.
+    """
+    try:
+        cur_sort_by, cur_sort_dir, sort_val, company_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError):
+        raise ValueError("Malformed cursor") from None
+    if (cur_sort_by, cur_sort_dir) != (sort_by, sort_dir):
+        raise ValueError("Cursor was issued for a different sort")
+    try:
+        # type() rather than isinstance() so JSON true/false can't pass as an int
+        if type(company_id) is not int:
+            raise TypeError(company_id)
+        if sort_val is not None:
+            python_type = _SORT_COLS[sort_by].type.python_type
+            if python_type is datetime:
+                sort_val = datetime.fromisoformat(sort_val)
+            elif type(sort_val) is not python_type:
+                raise TypeError(sort_val)
+    except (ValueError, TypeError):
+        raise ValueError("Malformed cursor") from None
+    return sort_val, company_id
+
+
 async def get_companies(
     db: AsyncSession,
     page: int = 1,
@@ -46,16 +174,21 @@ async def get_companies(
     revenue_bracket: str | None = None,
     sort_by: str = "created_at",
     sort_dir: str = "desc",
+    cursor: str | None = None,
+    skip_count: bool = False,
 ):
+    """List companies, newest first by default.
+
+    Pass the previous response's next_cursor to seek straight past its last row
+    (keyset pagination); without a cursor, page/per_page fall back to OFFSET.
+    With skip_count, total and pages come back as None instead of being counted.
+    Raises ValueError for a cursor that is malformed or from a different sort.
+    """
     query = select(Company)
 
     if search:
         pattern = f"%{search}%"
-        query = query.where(
-            (Company.name.ilike(pattern))
-            | (Company.domain.ilike(pattern))
-            | (Company.city.ilike(pattern))
-        )
+        query = query.where(or_(*(col.ilike(pattern) for col in _ILIKE_COLS)))
     if industry:
         query = query.where(Company.industry == industry)
     if state:
@@ -63,7 +196,7 @@ async def get_companies(
     if city:
         query = query.where(Company.city == city)
 
-    # Revenue bracket filtering — needs Python since revenue is a formatted string
+    # Revenue bracket filtering on the numeric column parsed at write time
     if revenue_bracket and revenue_bracket in REVENUE_BRACKETS:
         bracket = REVENUE_BRACKETS[revenue_bracket]
         if bracket == "unknown":
@@ -73,53 +206,71 @@ async def get_companies(
             )
         else:
             low, high = bracket
-            all_result = await db.execute(query.with_only_columns(Company.id, Company.estimated_revenue))
-            matching_ids = []
-            for cid, rev_str in all_result.all():
-                val = _parse_revenue_to_number(rev_str)
-                if val is None:
-                    continue
-                if low is not None and val < low:
-                    continue
-                if high is not None and val >= high:
-                    continue
-                matching_ids.append(cid)
-            if not matching_ids:
-                return {"items": [], "total": 0, "page": page, "per_page": per_page, "pages": 1}
-            query = select(Company).where(Company.id.in_(matching_ids))
-
-    # Count
-    count_query = select(func.count()).select_from(query.subquery())
-    total = (await db.execute(count_query)).scalar() or 0
+            if low is not None:
+                query = query.where(Company.estimated_revenue_numeric >= low)
+            if high is not None:
+                query = query.where(Company.estimated_revenue_numeric < high)
 
-    # Sort
-    sort_col = getattr(Company, sort_by, Company.created_at)
-    query = query.order_by(sort_col.desc() if sort_dir == "desc" else sort_col.asc())
-
-    # Paginate
-    query = query.offset((page - 1) * per_page).limit(per_page)
-    result = await db.execute(query)
-    companies = result.scalars().all()
-
-    # Attach contact counts
-    if companies:
-        ids = [c.id for c in companies]
-        counts_q = (
-            select(Contact.company_id, func.count(Contact.id))
-            .where(Contact.company_id.in_(ids))
-            .group_by(Contact.company_id)
-        )
-        counts = dict((await db.execute(counts_q)).all())
-        for c in companies:
-            c.contact_count = counts.get(c.id, 0)
+    # Count (cached per filter set, independent of page and sort)
+    total = None
+    if not skip_count:
+        filters_key = (search, industry, state, city, revenue_bracket)
+        total = await _count_companies(db, query, filters_key)
+
+    # Rows with a sort value come first, then the NULL tail. Each phase is a plain
+    # ORDER BY (sort_col, id) that the composite indexes serve in either direction,
+    # so cursor seeks stay index seeks (no NULLS LAST, no OR in the predicate)
+    sort_by = sort_by if sort_by in _SORT_COLS else "created_at"
+    sort_dir = "desc" if sort_dir == "desc" else "asc"
+    sort_col = _SORT_COLS[sort_by]
+    desc = sort_dir == "desc"
+    id_order = Company.id.desc() if desc else Company.id.asc()
+    valued = query.where(sort_col.isnot(None)).order_by(sort_col.desc() if desc else sort_col.asc(), id_order)
+    null_tail = query.where(sort_col.is_(None)).order_by(id_order)
+
+    tail_offset = 0
+    if cursor:
+        after_val, after_id = _decode_cursor(cursor, sort_by, sort_dir)
+        if after_val is not None:
+            key = tuple_(sort_col, Company.id)
+            seek = key < (after_val, after_id) if desc else key > (after_val, after_id)
+            companies = list((await db.execute(valued.where(seek).limit(per_page))).scalars())
+        else:
+            # Cursor is already inside the NULL tail; seek on id alone
+            companies = []
+            null_tail = null_tail.where(Company.id < after_id if desc else Company.id > after_id)
+    else:
+        offset = (page - 1) * per_page
+        companies = list((await db.execute(valued.offset(offset).limit(per_page))).scalars())
+        if not companies:
+            # The page starts past every valued row; count them to place it in the tail
+            valued_total = (await db.execute(
+                valued.with_only_columns(func.count(Company.id)).order_by(None)
+            )).scalar() or 0
+            tail_offset = max(0, offset - valued_total)
 
-    pages = max(1, (total + per_page - 1) // per_page)
-    return {"items": companies, "total": total, "page": page, "per_page": per_page, "pages": pages}
+    if len(companies) < per_page:
+        companies += (await db.execute(
+            null_tail.offset(tail_offset).limit(per_page - len(companies))
+        )).scalars()
+
+    next_cursor = None
+    if len(companies) == per_page:
+        last = companies[-1]
+        next_cursor = _encode_cursor(sort_by, sort_dir, getattr(last, sort_col.key), last.id)
+
+    pages = max(1, (total + per_page - 1) // per_page) if total is not None else None
+    return {
+        "items": companies, "total": total, "page": page, "per_page": per_page, "pages": pages,
+        "next_cursor": next_cursor,
+    }
 
 
 async def get_company(db: AsyncSession, company_id: int):
     result = await db.execute(
-        select(Company).options(selectinload(Company.contacts)).where(Company.id == company_id)
+        select(Company)
+        .options(selectinload(Company.contacts), raiseload("*"))
+        .where(Company.id == company_id)
     )
     return result.scalar_one_or_none()
 
@@ -133,21 +284,31 @@ async def create_company(db: AsyncSession, data: CompanyCreate) -> Company:
     existing = await get_company_by_domain(db, data.domain)
     if existing:
         return existing
-    company = Company(**data.model_dump())
-    db.add(company)
+    # INSERT ... RETURNING hands back the full row without a refresh; bulk-style
+    # inserts skip mapper events, so derive the numeric revenue here
+    values = data.model_dump()
+    values["estimated_revenue_numeric"] = _revenue_numeric(values["estimated_revenue"])
+    company = (await db.execute(insert(Company).values(**values).returning(Company))).scalar_one()
     await db.commit()
-    await db.refresh(company)
+    _invalidate_list_caches()
     return company
 
 
 async def update_company(db: AsyncSession, company_id: int, data: CompanyUpdate) -> Company | None:
-    company = await get_company(db, company_id)
-    if not company:
-        return None
-    for key, val in data.model_dump(exclude_unset=True).items():
-        setattr(company, key, val)
+    changes = data.model_dump(exclude_unset=True)
+    if not changes:
+        return await get_company(db, company_id)
+    # Single UPDATE ... RETURNING; bulk-style updates skip mapper events, so
+    # re-derive the numeric revenue here when the string changes
+    if "estimated_revenue" in changes:
+        changes["estimated_revenue_numeric"] = _revenue_numeric(changes["estimated_revenue"])
+    result = await db.execute(
+        update(Company).where(Company.id == company_id).values(**changes).returning(Company)
+    )
+    company = result.scalar_one_or_none()
     await db.commit()
-    await db.refresh(company)
+    if company:
+        _invalidate_list_caches()
     return company
 
 
@@ -157,25 +318,61 @@ async def delete_company(db: AsyncSession, company_id: int) -> bool:
         return False
     await db.delete(company)
     await db.commit()
+    _invalidate_list_caches()
     return True
 
 
+# companies columns offered as filter dropdowns by get_filter_options()
+_FACETS = ("industry", "state", "city")
+
+# Loose index scan: each step seeks the next value above the previous one via the
+# (column, id) indexes, so the cost scales with distinct values, not rows.
+# `col > ''` also drops NULL and empty values.
+_FACET_SCAN = (
+    "f_{col}(v) AS ("
+    "SELECT MIN({col}) FROM companies WHERE {col} > '' "
+    "UNION ALL "
+    "SELECT (SELECT MIN({col}) FROM companies WHERE {col} > f_{col}.v) FROM f_{col} WHERE f_{col}.v IS NOT NULL)"
+)
+_FILTER_OPTIONS_SQL = text(
+    "WITH RECURSIVE "
+    + ", ".join(_FACET_SCAN.format(col=col) for col in _FACETS)
+    + " "
+    + " UNION ALL ".join(f"SELECT '{col}' AS kind, v AS value FROM f_{col} WHERE v IS NOT NULL" for col in _FACETS)
+)
+
+
+async def get_filter_options(db: AsyncSession) -> dict[str, list[str]]:
+    """Distinct non-empty industries, states and cities, fetched in one round-trip.
+
+    Results are cached for FILTER_OPTIONS_TTL seconds; the lock keeps concurrent
+    page loads from all running the query when the cache is cold.
+    """
+    global _filter_options_cache
+    async with _filter_options_lock:
+        if _filter_options_cache and time.monotonic() < _filter_options_cache[1]:
+            return _filter_options_cache[0]
+        options = await _query_filter_options(db)
+        _filter_options_cache = (options, time.monotonic() + FILTER_OPTIONS_TTL)
+        return options
+
+
+async def _query_filter_options(db: AsyncSession) -> dict[str, list[str]]:
+    options: dict[str, list[str]] = {col: [] for col in _FACETS}
+    for kind, value in (await db.execute(_FILTER_OPTIONS_SQL)).all():
+        options[kind].append(value)
+    for values in options.values():
+        values.sort()
+    return options
+
+
 async def get_distinct_industries(db: AsyncSession) -> list[str]:
-    result = await db.execute(
-        select(Company.industry).where(Company.industry.isnot(None)).distinct()
-    )
-    return [r[0] for r in result.all()]
+    return (await get_filter_options(db))["industry"]
 
 
 async def get_distinct_states(db: AsyncSession) -> list[str]:
-    result = await db.execute(
-        select(Company.state).where(Company.state.isnot(None)).where(Company.state != "").distinct().order_by(Company.state)
-    )
-    return [r[0] for r in result.all()]
+    return (await get_filter_options(db))["state"]
 
 
 async def get_distinct_cities(db: AsyncSession) -> list[str]:
-    result = await db.execute(
-        select(Company.city).where(Company.city.isnot(None)).where(Company.city != "").distinct().order_by(Company.city)
-    )
-    return [r[0] for r in result.all()]
+    return (await get_filter_options(db))["city"]
@@ -1,10 +1,25 @@
-from sqlalchemy import select
+from sqlalchemy import event, insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.models import Contact
+from app.db.models import Company, Contact
 from app.schemas.contact import ContactCreate, ContactUpdate
 
 
+# Company.contact_count is denormalized; adjust it in the same transaction as the contact row
+def _contact_count_update(company_id: int, delta: int):
+    return update(Company).where(Company.id == company_id).values(contact_count=Company.contact_count + delta)
+
+
+@event.listens_for(Contact, "after_insert")
+def _increment_contact_count(mapper, connection, target: Contact) -> None:
+    connection.execute(_contact_count_update(target.company_id, 1))
+
+
+@event.listens_for(Contact, "after_delete")
+def _decrement_contact_count(mapper, connection, target: Contact) -> None:
+    connection.execute(_contact_count_update(target.company_id, -1))
+
+
 async def get_contacts_for_company(db: AsyncSession, company_id: int):
     result = await db.execute(
         select(Contact).where(Contact.company_id == company_id).order_by(Contact.email_confidence.desc())
@@ -18,21 +33,22 @@ async def get_contact(db: AsyncSession, contact_id: int):
 
 
 async def create_contact(db: AsyncSession, data: ContactCreate) -> Contact:
-    contact = Contact(**data.model_dump())
-    db.add(contact)
+    # INSERT ... RETURNING skips the refresh; it also skips the after_insert event
+    contact = (await db.execute(insert(Contact).values(**data.model_dump()).returning(Contact))).scalar_one()
+    await db.execute(_contact_count_update(data.company_id, 1))
     await db.commit()
-    await db.refresh(contact)
     return contact
 
 
 async def update_contact(db: AsyncSession, contact_id: int, data: ContactUpdate) -> Contact | None:
-    contact = await get_contact(db, contact_id)
-    if not contact:
-        return None
-    for key, val in data.model_dump(exclude_unset=True).items():
-        setattr(contact, key, val)
+    changes = data.model_dump(exclude_unset=True)
+    if not changes:
+        return await get_contact(db, contact_id)
+    result = await db.execute(
+        update(Contact).where(Contact.id == contact_id).values(**changes).returning(Contact)
+    )
+    contact = result.scalar_one_or_none()
     await db.commit()
-    await db.refresh(contact)
     return contact
 
 
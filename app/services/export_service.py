@@ -1,28 +1,43 @@
 import csv
 import io
+from collections.abc import AsyncIterator
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
-from app.db.models import Company
+from app.db.models import Company, Contact
 
+EXPORT_BATCH_SIZE = 500
 
-async def export_companies_csv(
+
+async def export_companies_csv_stream(
     db: AsyncSession,
     industry: str | None = None,
     state: str | None = None,
-) -> str:
-    query = select(Company).options(selectinload(Company.contacts))
+) -> AsyncIterator[str]:
+    """Yield the CSV export in chunks, one per batch of rows."""
+    # Flat Core rows in CSV column order; the outer join gives companies without
+    # contacts a single row with NULL contact fields, which csv writes as ""
+    query = (
+        select(
+            Company.name, Company.domain, Company.website,
+            Company.industry, Company.sub_industry, Company.description,
+            Company.employee_count_range, Company.employee_count,
+            Company.estimated_revenue, Company.revenue_source,
+            Company.city, Company.state, Company.zip_code, Company.phone,
+            Contact.full_name, Contact.title, Contact.email,
+            Contact.email_confidence, Contact.phone, Contact.linkedin_url,
+            Company.source,
+        )
+        .outerjoin(Contact, Contact.company_id == Company.id)
+    )
 
     if industry:
         query = query.where(Company.industry == industry)
     if state:
         query = query.where(Company.state == state)
 
-    query = query.order_by(Company.name)
-    result = await db.execute(query)
-    companies = result.scalars().all()
+    query = query.order_by(Company.name, Company.id, Contact.id).execution_options(yield_per=EXPORT_BATCH_SIZE)
 
     output = io.StringIO()
     writer = csv.writer(output)
@@ -33,23 +48,11 @@ async def export_companies_csv(
         "Contact Name", "Contact Title", "Contact Email", "Email Confidence",
         "Contact Phone", "LinkedIn URL", "Source",
     ])
-
-    for company in companies:
-        base_row = [
-            company.name, company.domain, company.website,
-            company.industry, company.sub_industry, company.description,
-            company.employee_count_range, company.employee_count,
-            company.estimated_revenue, company.revenue_source,
-            company.city, company.state, company.zip_code, company.phone,
-        ]
-        if company.contacts:
-            for contact in company.contacts:
-                writer.writerow(base_row + [
-                    contact.full_name, contact.title, contact.email,
-                    contact.email_confidence, contact.phone, contact.linkedin_url,
-                    company.source,
-                ])
-        else:
-            writer.writerow(base_row + ["", "", "", "", "", "", company.source])
-
-    return output.getvalue()
+    yield output.getvalue()
+
+    result = await db.stream(query)
+    async for rows in result.partitions():
+        output.seek(0)
+        output.truncate(0)
+        writer.writerows(rows)
+        yield output.getvalue()
@@ -1,10 +1,80 @@
+import asyncio
+import logging
 from datetime import datetime, timezone
 
-from sqlalchemy import select
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.db.database import async_session
 from app.db.models import ScrapeJob, ScrapeLog, ScrapeQueue
 
+logger = logging.getLogger(__name__)
+
+# Progress counters change many times a second and log rows arrive in bursts
+# during a crawl. Both are buffered and written by a timer on a session of its
+# own: one UPDATE per job with coalesced counters and one executemany batch of
+# log rows per tick. Anything recorded is in the DB within FLUSH_INTERVAL, even
+# when the job goes quiet right after.
+FLUSH_INTERVAL = 0.25  # seconds
+_pending_progress: dict[int, dict[str, int]] = {}
+_pending_logs: dict[int, list[dict]] = {}
+_flush_lock = asyncio.Lock()
+_flush_timer: asyncio.Task | None = None
+
+
+def _schedule_flush() -> None:
+    global _flush_timer
+    if _flush_timer is None:
+        _flush_timer = asyncio.create_task(_flush_soon())
+
+
+async def _flush_soon():
+    global _flush_timer
+    await asyncio.sleep(FLUSH_INTERVAL)
+    _flush_timer = None  # writes from here on schedule the next tick
+    await flush_pending_writes()
+
+
+async def flush_pending_writes():
+    """Write all buffered progress and log rows now. Called by the timer and when a job ends."""
+    async with _flush_lock:
+        progress = dict(_pending_progress)
+        _pending_progress.clear()
+        logs = dict(_pending_logs)
+        _pending_logs.clear()
+        job_ids = list(progress.keys() | logs.keys())
+        if not job_ids:
+            return
+        async with async_session() as db:
+            # One transaction per job, so a bad row only costs that job's batch
+            for n, job_id in enumerate(job_ids):
+                values, rows = progress.get(job_id), logs.get(job_id)
+                try:
+                    if values:
+                        await db.execute(update(ScrapeJob).where(ScrapeJob.id == job_id).values(**values))
+                    if rows:
+                        await db.execute(insert(ScrapeLog), rows)
+                    await db.commit()
+                except OperationalError:
+                    # Usually a busy SQLite writer; merge this and the unwritten jobs
+                    # back under anything newer and retry on the next tick
+                    await db.rollback()
+                    logger.warning("Deferring writes for %d jobs: database busy", len(job_ids) - n)
+                    for retry_id in job_ids[n:]:
+                        if retry_id in progress:
+                            _pending_progress[retry_id] = {**progress[retry_id], **_pending_progress.get(retry_id, {})}
+                        if retry_id in logs:
+                            _pending_logs[retry_id] = logs[retry_id] + _pending_logs.get(retry_id, [])
+                    _schedule_flush()
+                    return
+                except Exception:
+                    await db.rollback()
+                    logger.exception(
+                        "Dropping progress and %d log rows for job %s that failed to write",
+                        len(rows or ()), job_id,
+                    )
+
 
 async def get_job(db: AsyncSession, job_id: int) -> ScrapeJob | None:
     result = await db.execute(select(ScrapeJob).where(ScrapeJob.id == job_id))
@@ -12,15 +82,25 @@ async def get_job(db: AsyncSession, job_id: int) -> ScrapeJob | None:
 
 
 async def update_job_status(db: AsyncSession, job_id: int, status: str):
-    job = await get_job(db, job_id)
-    if not job:
-        return
-    job.status = status
-    if status == "running" and not job.started_at:
-        job.started_at = datetime.now(timezone.utc)
+    values = {"status": status}
+    if status == "running":
+        values["started_at"] = func.coalesce(ScrapeJob.started_at, datetime.now(timezone.utc))
     if status in ("completed", "failed", "cancelled"):
-        job.completed_at = datetime.now(timezone.utc)
-    await db.commit()
+        values["completed_at"] = datetime.now(timezone.utc)
+    # Holding the flush lock keeps a timer write of older counters from landing
+    # after the final ones folded into this UPDATE
+    async with _flush_lock:
+        if "completed_at" in values:
+            values.update(_pending_progress.pop(job_id, {}))
+        # coalesce() is a SQL expression the ORM can't evaluate, so it would expire
+        # started_at on a loaded ScrapeJob and the next read would lazy-load outside
+        # the greenlet. Returning the row with populate_existing refreshes it instead.
+        await db.execute(
+            update(ScrapeJob).where(ScrapeJob.id == job_id).values(**values)
+            .returning(ScrapeJob)
+            .execution_options(synchronize_session="fetch", populate_existing=True)
+        )
+        await db.commit()
 
 
 async def update_job_progress(
@@ -32,26 +112,28 @@ async def update_job_progress(
     contacts_found: int | None = None,
     errors_count: int | None = None,
 ):
-    job = await get_job(db, job_id)
-    if not job:
-        return
+    """Record progress counters; the flush timer writes them within FLUSH_INTERVAL."""
+    pending = _pending_progress.setdefault(job_id, {})
     if processed_urls is not None:
-        job.processed_urls = processed_urls
+        pending["processed_urls"] = processed_urls
     if total_urls is not None:
-        job.total_urls = total_urls
+        pending["total_urls"] = total_urls
     if companies_found is not None:
-        job.companies_found = companies_found
+        pending["companies_found"] = companies_found
     if contacts_found is not None:
-        job.contacts_found = contacts_found
+        pending["contacts_found"] = contacts_found
     if errors_count is not None:
-        job.errors_count = errors_count
-    await db.commit()
+        pending["errors_count"] = errors_count
+    _schedule_flush()
 
 
 async def add_log(db: AsyncSession, job_id: int, level: str, message: str, url: str | None = None):
-    log = ScrapeLog(scrape_job_id=job_id, level=level, message=message, url=url)
-    db.add(log)
-    await db.commit()
+    """Buffer a log row; the flush timer writes it within FLUSH_INTERVAL."""
+    _pending_logs.setdefault(job_id, []).append({
+        "scrape_job_id": job_id, "level": level, "message": message, "url": url,
+        "created_at": datetime.now(timezone.utc),
+    })
+    _schedule_flush()
 
 
 async def add_to_queue(db: AsyncSession, job_id: int, url: str, url_type: str = "company_page", priority: int = 0):
@@ -62,22 +144,34 @@ async def add_to_queue(db: AsyncSession, job_id: int, url: str, url_type: str =
 
 
 async def get_pending_queue_items(db: AsyncSession, job_id: int, limit: int = 10) -> list[ScrapeQueue]:
-    result = await db.execute(
-        select(ScrapeQueue)
+    """Atomically mark up to `limit` pending items as processing and return them.
+
+    On Postgres, FOR UPDATE SKIP LOCKED lets concurrent workers claim disjoint
+    batches without waiting on each other; SQLite serializes writers anyway.
+    """
+    next_ids = (
+        select(ScrapeQueue.id)
         .where(ScrapeQueue.scrape_job_id == job_id, ScrapeQueue.status == "pending")
         .order_by(ScrapeQueue.priority.desc(), ScrapeQueue.id)
         .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    result = await db.execute(
+        update(ScrapeQueue)
+        .where(ScrapeQueue.id.in_(next_ids.scalar_subquery()))
+        .values(status="processing")
+        .returning(ScrapeQueue)
     )
-    return list(result.scalars().all())
+    items = sorted(result.scalars().all(), key=lambda i: (-(i.priority or 0), i.id))
+    await db.commit()
+    return items
 
 
 async def update_queue_item(db: AsyncSession, item_id: int, status: str, error_message: str | None = None):
-    result = await db.execute(select(ScrapeQueue).where(ScrapeQueue.id == item_id))
-    item = result.scalar_one_or_none()
-    if item:
-        item.status = status
-        if error_message:
-            item.error_message = error_message
-        if status in ("completed", "failed"):
-            item.processed_at = datetime.now(timezone.utc)
-        await db.commit()
+    values = {"status": status}
+    if error_message:
+        values["error_message"] = error_message
+    if status in ("completed", "failed"):
+        values["processed_at"] = datetime.now(timezone.utc)
+    await db.execute(update(ScrapeQueue).where(ScrapeQueue.id == item_id).values(**values))
+    await db.commit()
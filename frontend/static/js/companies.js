@@ -1,16 +1,14 @@
 document.addEventListener("DOMContentLoaded", async () => {
     let page = 1;
+    let cursors = {};  // page number -> keyset cursor returned by the previous page
     let sortBy = "created_at";
     let sortDir = "desc";
     let searchTimer = null;
 
     // Load filter options
     try {
-        const [industries, states, cities] = await Promise.all([
-            api.get("/api/companies/industries"),
-            api.get("/api/companies/states"),
-            api.get("/api/companies/cities"),
-        ]);
+        const options = await api.get("/api/companies/filter-options");
+        const industries = options.industry, states = options.state, cities = options.city;
         const indSel = $("#filter-industry");
         industries.forEach(i => {
             const opt = document.createElement("option");
@@ -45,6 +43,8 @@ document.addEventListener("DOMContentLoaded", async () => {
         const params = new URLSearchParams({
             page, per_page: 25, sort_by: sortBy, sort_dir: sortDir,
         });
+        if (page === 1) cursors = {};
+        if (cursors[page]) params.set("cursor", cursors[page]);
         if (search) params.set("search", search);
         if (industry) params.set("industry", industry);
         if (state) params.set("state", state);
@@ -53,6 +53,7 @@ document.addEventListener("DOMContentLoaded", async () => {
 
         try {
             const data = await api.get(`/api/companies?${params}`);
+            if (data.next_cursor) cursors[page + 1] = data.next_cursor;
             const body = $("#companies-body");
             if (data.items.length === 0) {
                 body.innerHTML = '<tr><td colspan="11">No companies found</td></tr>';
@@ -0,0 +1,144 @@
+import asyncio
+import base64
+import json
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event, insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.db.models import Base, Company
+from app.services import company_service
+
+SORTS = [
+    ("created_at", "desc"),
+    ("created_at", "asc"),
+    ("city", "asc"),
+    ("city", "desc"),
+    ("employee_count", "desc"),
+]
+
+
+def _rows(n: int) -> list[dict]:
+    base = datetime(2024, 1, 1)
+    return [
+        {
+            "name": f"Company {i}",
+            "domain": f"company{i}.com",
+            # Duplicate timestamps and cities exercise the id tie-breaker
+            "created_at": base + timedelta(minutes=i // 3),
+            "city": None if i % 5 == 0 else f"City {i % 7}",
+            "employee_count": None if i % 4 == 0 else i % 11,
+        }
+        for i in range(n)
+    ]
+
+
+async def _setup(db_path, n: int):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(insert(Company), _rows(n))
+    return engine, async_sessionmaker(engine, expire_on_commit=False)
+
+
+async def _walk(session, per_page: int, **kwargs) -> tuple[list[int], list[int]]:
+    """Return (ids by following next_cursor, ids by OFFSET pages)."""
+    by_cursor, cursor = [], None
+    while True:
+        page = await company_service.get_companies(
+            session, per_page=per_page, cursor=cursor, skip_count=True, **kwargs
+        )
+        by_cursor += [c.id for c in page["items"]]
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+
+    by_offset, page_no = [], 1
+    while True:
+        page = await company_service.get_companies(
+            session, page=page_no, per_page=per_page, skip_count=True, **kwargs
+        )
+        if not page["items"]:
+            break
+        by_offset += [c.id for c in page["items"]]
+        page_no += 1
+    return by_cursor, by_offset
+
+
+@pytest.mark.parametrize("sort_by,sort_dir", SORTS)
+def test_cursor_pages_match_offset_pages(tmp_path, sort_by, sort_dir):
+    async def run():
+        engine, sessions = await _setup(tmp_path / "pages.db", 61)
+        async with sessions() as session:
+            by_cursor, by_offset = await _walk(session, 7, sort_by=sort_by, sort_dir=sort_dir)
+        await engine.dispose()
+        return by_cursor, by_offset
+
+    by_cursor, by_offset = asyncio.run(run())
+    assert by_cursor == by_offset
+    assert sorted(by_cursor) == list(range(1, 62))
+
+
+def test_cursor_seek_uses_index(tmp_path):
+    db_path = tmp_path / "seek.db"
+    statements = []
+
+    async def run():
+        engine, sessions = await _setup(db_path, 2000)
+        event.listen(
+            engine.sync_engine, "before_cursor_execute",
+            lambda conn, cursor, stmt, params, ctx, many: statements.append((stmt, params)),
+        )
+        async with sessions() as session:
+            first = await company_service.get_companies(session, per_page=25, skip_count=True)
+            await company_service.get_companies(
+                session, per_page=25, cursor=first["next_cursor"], skip_count=True
+            )
+        await engine.dispose()
+
+    asyncio.run(run())
+    seek = [(s, p) for s, p in statements if "(companies.created_at, companies.id) <" in s]
+    assert len(seek) == 1
+
+    stmt, params = seek[0]
+    with sqlite3.connect(db_path) as conn:
+        plan = " ".join(row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {stmt}", params))
+    assert "SEARCH companies USING INDEX ix_company_created_at_id" in plan
+    assert "SCAN" not in plan
+
+
+def test_cursor_rejects_other_sort(tmp_path):
+    async def run():
+        engine, sessions = await _setup(tmp_path / "mismatch.db", 30)
+        async with sessions() as session:
+            first = await company_service.get_companies(session, per_page=10, skip_count=True)
+            try:
+                with pytest.raises(ValueError):
+                    await company_service.get_companies(
+                        session, per_page=10, cursor=first["next_cursor"],
+                        sort_by="employee_count", skip_count=True,
+                    )
+                with pytest.raises(ValueError):
+                    await company_service.get_companies(
+                        session, per_page=10, cursor="not-a-cursor", skip_count=True
+                    )
+            finally:
+                await engine.dispose()
+
+    asyncio.run(run())
+
+
+@pytest.mark.parametrize("sort_by,sort_val,company_id", [
+    ("created_at", 123, 1),
+    ("created_at", "not-a-date", 1),
+    ("employee_count", "12", 1),
+    ("employee_count", True, 1),
+    ("city", 5, 1),
+    ("city", "Austin", "1"),
+])
+def test_cursor_rejects_mistyped_values(sort_by, sort_val, company_id):
+    cursor = base64.urlsafe_b64encode(json.dumps([sort_by, "desc", sort_val, company_id]).encode()).decode()
+    with pytest.raises(ValueError, match="Malformed cursor"):
+        company_service._decode_cursor(cursor, sort_by, "desc")
@@ -0,0 +1,68 @@
+import asyncio
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.db.models import Base, ScrapeJob, ScrapeLog
+from app.services import job_service
+
+
+def test_status_update_keeps_loaded_job_readable(tmp_path):
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'jobs.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        sessions = async_sessionmaker(engine, expire_on_commit=False)
+        try:
+            async with sessions() as session:
+                job = ScrapeJob(name="job")
+                session.add(job)
+                await session.commit()
+
+                await job_service.update_job_status(session, job.id, "running")
+                # A lazy refresh here would raise MissingGreenlet
+                started_at = job.started_at
+                assert started_at is not None
+
+                await job_service.update_job_status(session, job.id, "running")
+                assert job.started_at == started_at
+
+                await job_service.update_job_status(session, job.id, "completed")
+                assert (job.status, job.started_at) == ("completed", started_at)
+                assert job.completed_at is not None
+        finally:
+            await engine.dispose()
+
+    asyncio.run(run())
+
+
+def test_flush_drops_only_the_failing_job(tmp_path, monkeypatch):
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'flush.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        sessions = async_sessionmaker(engine, expire_on_commit=False)
+        monkeypatch.setattr(job_service, "async_session", sessions)
+        monkeypatch.setattr(job_service, "_schedule_flush", lambda: None)
+        try:
+            async with sessions() as session:
+                good, bad = ScrapeJob(name="good"), ScrapeJob(name="bad")
+                session.add_all([good, bad])
+                await session.commit()
+
+                await job_service.add_log(session, good.id, "info", "kept")
+                await job_service.update_job_progress(session, good.id, processed_urls=4)
+                await job_service.add_log(session, bad.id, "info", None)  # violates NOT NULL
+                await job_service.update_job_progress(session, bad.id, processed_urls=9)
+                await job_service.flush_pending_writes()
+
+                logs = (await session.execute(select(ScrapeLog.scrape_job_id, ScrapeLog.message))).all()
+                assert logs == [(good.id, "kept")]
+                await session.refresh(good)
+                await session.refresh(bad)
+                assert (good.processed_urls, bad.processed_urls) == (4, 0)
+                assert not job_service._pending_logs and not job_service._pending_progress
+        finally:
+            await engine.dispose()
+
+    asyncio.run(run())